@@ -10,19 +10,25 @@ License: MIT
 """
 
 import os
+import io
 import sys
 import csv
+import gzip
 import sqlite3
 import logging
 import smtplib
+import socket
+import shutil
 import hashlib
+import queue
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
+from email.message import EmailMessage
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple, Iterable, Iterator, Callable
 from collections import defaultdict
 import json
 
@@ -33,11 +39,19 @@ from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle,
     PageBreak, Image
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+# ReportLab uses the rl_accel C extension (reportlab[accel]) for string
+# width measurement when it is installed, and pure Python otherwise
+try:
+    import _rl_accel  # noqa: F401
+    RL_ACCEL_AVAILABLE = True
+except ImportError:
+    RL_ACCEL_AVAILABLE = False
+
 # =============================================================================
 # Python 3.12+ SQLite datetime adapter fix
 # =============================================================================
@@ -86,11 +100,16 @@ class Config:
     cucm_username: str = ""
     cucm_password: str = ""
     cucm_cdr_path: str = "/var/log/active/cm/cdr_repository/processed"
+    sftp_workers: int = 4
+    sftp_socket_buffer: int = 0
     
     # Local Storage
     local_cdr_dir: str = "./cdr_files"
     database_path: str = "./cdr_database.db"
     
+    # Processing
+    parse_workers: int = 0
+    
     # Report Settings
     report_output_dir: str = "./reports"
     hours_to_analyze: int = 24
@@ -201,21 +220,49 @@ CAUSE_CODES = {
 }
 
 # Cause codes that indicate a failed call (not normal completion)
-FAILED_CAUSE_CODES = {
+FAILED_CAUSE_CODES = frozenset({
     1, 2, 3, 17, 18, 19, 20, 21, 22, 27, 28, 29, 31, 34, 38, 41, 42, 43, 44,
     46, 47, 49, 50, 52, 54, 57, 58, 63, 65, 66, 69, 79, 88, 95, 96, 97, 98,
     99, 100, 101, 102, 111, 127
-}
+})
+
+# Successful call codes to exclude (checked for every CDR row)
+SUCCESS_CODES = frozenset({0, 16, 393216})
+
+# "Unknown cause code: N" strings, built once per code and then shared
+_UNKNOWN_CAUSE_REASONS: Dict[int, str] = {}
+
 
-# Successful call codes to exclude
-SUCCESS_CODES = {0, 16, 393216}
+def _cause_reason(cause: int) -> str:
+    """Get the human-readable reason for a cause code"""
+    reason = CAUSE_CODES.get(cause)
+    if reason is None:
+        reason = _UNKNOWN_CAUSE_REASONS.get(cause)
+        if reason is None:
+            reason = _UNKNOWN_CAUSE_REASONS[cause] = f"Unknown cause code: {cause}"
+    return reason
+
+
+# SFTP transfer tuning
+SFTP_READ_BLOCK_SIZE = 256 * 1024
+SFTP_WINDOW_SIZE = 4 * 1024 * 1024
+SFTP_MAX_PACKET_SIZE = 32768
+SFTP_KEEPALIVE_SECONDS = 30
+
+# File hash used as the dedupe key in processed_files and failed_calls.
+# SHA256 is FIPS approved and, with SHA extensions, faster than BLAKE2b;
+# changing it would make every stored hash stop matching.
+FILE_HASH_ALGORITHM = "sha256"
+
+# Local CDR file read size when hashing while parsing
+FILE_READ_BLOCK_SIZE = 1024 * 1024
 
 
 # =============================================================================
 # DATA MODELS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class CDRRecord:
     """Represents a single CDR record"""
     cdr_record_type: int = 0
@@ -250,6 +297,15 @@ class CDRRecord:
     orig_video_cap_bandwidth: int = 0
     dest_video_cap_bandwidth: int = 0
     
+    # Derived once from the cause values when the record is built
+    primary_cause_code: int = field(init=False)
+    failure_reason: str = field(init=False)
+    
+    def __post_init__(self):
+        cause = self.dest_cause_value if self.dest_cause_value != 0 else self.orig_cause_value
+        self.primary_cause_code = cause
+        self.failure_reason = _cause_reason(cause)
+    
     @property
     def is_failed(self) -> bool:
         """Determine if this call was failed/unsuccessful"""
@@ -259,17 +315,36 @@ class CDRRecord:
             if self.orig_cause_value not in SUCCESS_CODES:
                 return True
         return False
-    
-    @property
-    def failure_reason(self) -> str:
-        """Get human-readable failure reason"""
-        cause = self.dest_cause_value if self.dest_cause_value != 0 else self.orig_cause_value
-        return CAUSE_CODES.get(cause, f"Unknown cause code: {cause}")
-    
-    @property
-    def primary_cause_code(self) -> int:
-        """Get the primary cause code for the failure"""
-        return self.dest_cause_value if self.dest_cause_value != 0 else self.orig_cause_value
+
+
+@dataclass(frozen=True, slots=True)
+class CauseRow:
+    """A cause code line of a report, formatted once for every renderer"""
+    code: int
+    reason: str
+    reason_short: str
+    count: int
+    pct: str
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceRow:
+    """A top-device line of a report"""
+    name: str
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class ReportModel:
+    """Everything the PDF and HTML reports show, built once per report"""
+    cluster_name: str
+    generated: str
+    generated_short: str
+    total_failed_calls: int
+    analysis_period_hours: int
+    causes: List[CauseRow]
+    devices: List[DeviceRow]
+    detail_rows: List[List[str]]
 
 
 # =============================================================================
@@ -279,6 +354,24 @@ class CDRRecord:
 class CDRDatabase:
     """SQLite database handler for CDR storage and retention"""
     
+    INSERT_BATCH_SIZE = 1000
+    
+    # Bound parameters per IN (...) lookup; SQLite builds before 3.32 cap a
+    # statement at 999 parameters
+    _MAX_IN_PARAMS = 500
+    
+    _INSERT_FAILED_CALL = '''
+        {verb} INTO failed_calls 
+        (global_call_id, date_time_origination, calling_party_number,
+         original_called_party_number, final_called_party_number,
+         orig_cause_value, dest_cause_value, failure_reason, duration,
+         orig_device_name, dest_device_name, orig_ip_addr, dest_ip_addr,
+         file_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_NEW_CALLS = _INSERT_FAILED_CALL.format(verb='INSERT')
+    _INSERT_OR_IGNORE_CALLS = _INSERT_FAILED_CALL.format(verb='INSERT OR IGNORE')
+    
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = None
@@ -295,6 +388,14 @@ class CDRDatabase:
         
         cursor = self.conn.cursor()
         
+        # WAL with synchronous=NORMAL avoids an fsync per commit while
+        # staying crash-safe; the rest keep temp data and hot pages in memory
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-65536')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS failed_calls (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -324,20 +425,43 @@ class CDRDatabase:
                 file_hash TEXT,
                 records_processed INTEGER,
                 failed_calls_found INTEGER,
-                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                file_size INTEGER,
+                file_mtime INTEGER
             )
         ''')
         
+        # Databases created before file fingerprints were tracked
+        cursor.execute('PRAGMA table_info(processed_files)')
+        processed_columns = {row['name'] for row in cursor.fetchall()}
+        for column in ('file_size', 'file_mtime'):
+            if column not in processed_columns:
+                cursor.execute(f'ALTER TABLE processed_files ADD COLUMN {column} INTEGER')
+        
+        # Covers every column the report window reads, so the stats scan is
+        # answered from the index alone. It leads with date_time_origination
+        # and so also replaces the old single-column datetime index.
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_failed_calls_dt_cause'"
+        )
+        covering_index_exists = cursor.fetchone() is not None
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_failed_calls_datetime 
-            ON failed_calls(date_time_origination)
+            CREATE INDEX IF NOT EXISTS idx_failed_calls_dt_cause 
+            ON failed_calls(date_time_origination, dest_cause_value, failure_reason,
+                            calling_party_number, original_called_party_number,
+                            orig_device_name)
         ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_failed_calls_datetime')
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_failed_calls_cause 
             ON failed_calls(dest_cause_value)
         ''')
         
         self.conn.commit()
+        
+        if not covering_index_exists:
+            # Give the planner statistics for the new index
+            cursor.execute('ANALYZE')
     
     def _format_datetime_for_query(self, dt: datetime) -> str:
         """Format datetime as ISO string for SQL queries"""
@@ -352,60 +476,147 @@ class CDRDatabase:
         )
         return cursor.fetchone() is not None
     
+    def is_fingerprint_processed(self, filename: str, file_size: int, file_mtime: int) -> bool:
+        """Check if a file with this name, size and mtime has been processed.
+        
+        CUCM CDR filenames are unique, so a matching fingerprint lets the
+        caller skip reading and hashing the file altogether.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            'SELECT 1 FROM processed_files WHERE filename = ? AND file_size = ? AND file_mtime = ?',
+            (filename, file_size, file_mtime)
+        )
+        return cursor.fetchone() is not None
+    
+    def get_processed_fingerprints(self, filenames: Iterable[str]) -> Set[Tuple[str, int, int]]:
+        """Get the (filename, size, mtime) fingerprints recorded for these files"""
+        filenames = list(filenames)
+        fingerprints = set()
+        cursor = self.conn.cursor()
+        for start in range(0, len(filenames), self._MAX_IN_PARAMS):
+            chunk = filenames[start:start + self._MAX_IN_PARAMS]
+            cursor.execute(
+                'SELECT filename, file_size, file_mtime FROM processed_files '
+                f'WHERE filename IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            fingerprints.update(tuple(row) for row in cursor.fetchall())
+        return fingerprints
+    
+    def update_file_fingerprint(self, filename: str, file_size: int, file_mtime: int):
+        """Record the current size and mtime of an already processed file"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            'UPDATE processed_files SET file_size = ?, file_mtime = ? WHERE filename = ?',
+            (file_size, file_mtime, filename)
+        )
+        self.conn.commit()
+    
     def mark_file_processed(self, filename: str, file_hash: str, 
-                           records_processed: int, failed_calls_found: int):
+                           records_processed: int, failed_calls_found: int,
+                           file_size: Optional[int] = None,
+                           file_mtime: Optional[int] = None):
         """Mark a file as processed"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        with self.conn:
+            self.mark_file_processed_no_commit(filename, file_hash, records_processed,
+                                               failed_calls_found, file_size, file_mtime)
+    
+    def mark_file_processed_no_commit(self, filename: str, file_hash: str,
+                                      records_processed: int, failed_calls_found: int,
+                                      file_size: Optional[int] = None,
+                                      file_mtime: Optional[int] = None):
+        """Mark a file as processed inside the caller's transaction"""
+        self.conn.execute('''
             INSERT OR REPLACE INTO processed_files 
-            (filename, file_hash, records_processed, failed_calls_found, processed_at)
-            VALUES (?, ?, ?, ?, ?)
+            (filename, file_hash, records_processed, failed_calls_found, processed_at,
+             file_size, file_mtime)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (filename, file_hash, records_processed, failed_calls_found, 
-              self._format_datetime_for_query(datetime.now())))
-        self.conn.commit()
+              self._format_datetime_for_query(datetime.now()), file_size, file_mtime))
+    
+    def _failed_call_row(self, record: CDRRecord, file_hash: str) -> Tuple:
+        """Build the failed_calls parameter tuple for a record"""
+        return (
+            record.global_call_id,
+            self._format_datetime_for_query(record.date_time_origination),
+            record.calling_party_number,
+            record.original_called_party_number,
+            record.final_called_party_number,
+            record.orig_cause_value,
+            record.dest_cause_value,
+            record.failure_reason,
+            record.duration,
+            record.orig_device_name,
+            record.dest_device_name,
+            record.orig_ip_addr,
+            record.dest_ip_addr,
+            file_hash
+        )
+    
+    def is_file_known(self, filename: str, file_hash: str) -> bool:
+        """Check if a file name or its content has been processed before"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            'SELECT 1 FROM processed_files WHERE filename = ? OR file_hash = ? LIMIT 1',
+            (filename, file_hash)
+        )
+        return cursor.fetchone() is not None
+    
+    def insert_failed_calls(self, records: Iterable[CDRRecord], file_hash: str,
+                            dedupe: bool = True) -> int:
+        """Insert failed call records in a single transaction"""
+        with self.conn:
+            return self.insert_failed_calls_no_commit(records, file_hash, dedupe)
+    
+    def insert_failed_calls_no_commit(self, records: Iterable[CDRRecord], file_hash: str,
+                                      dedupe: bool = True) -> int:
+        """Insert failed call records inside the caller's transaction.
+        
+        Records are consumed lazily and written in batches of
+        INSERT_BATCH_SIZE, so a generator can be streamed straight in.
+        When dedupe is False (first load of a new file) a plain INSERT is
+        used, which skips the conflict-resolution path; if a batch still
+        collides with existing rows it and the rest of the stream fall back
+        to INSERT OR IGNORE. Returns the number of records consumed.
+        """
+        make_row = self._failed_call_row
+        rows = (make_row(record, file_hash) for record in records)
+        sql = self._INSERT_OR_IGNORE_CALLS if dedupe else self._INSERT_NEW_CALLS
+        consumed = 0
+        while True:
+            batch = list(islice(rows, self.INSERT_BATCH_SIZE))
+            if not batch:
+                break
+            try:
+                self.conn.executemany(sql, batch)
+            except sqlite3.IntegrityError:
+                # Only the failing row was aborted; rows already written
+                # in this batch are skipped as duplicates on the retry
+                logger.debug("Duplicate calls in new file, retrying with INSERT OR IGNORE")
+                sql = self._INSERT_OR_IGNORE_CALLS
+                self.conn.executemany(sql, batch)
+            consumed += len(batch)
+        return consumed
     
     def insert_failed_call(self, record: CDRRecord, file_hash: str):
         """Insert a failed call record"""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO failed_calls 
-                (global_call_id, date_time_origination, calling_party_number,
-                 original_called_party_number, final_called_party_number,
-                 orig_cause_value, dest_cause_value, failure_reason, duration,
-                 orig_device_name, dest_device_name, orig_ip_addr, dest_ip_addr,
-                 file_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                record.global_call_id,
-                self._format_datetime_for_query(record.date_time_origination),
-                record.calling_party_number,
-                record.original_called_party_number,
-                record.final_called_party_number,
-                record.orig_cause_value,
-                record.dest_cause_value,
-                record.failure_reason,
-                record.duration,
-                record.orig_device_name,
-                record.dest_device_name,
-                record.orig_ip_addr,
-                record.dest_ip_addr,
-                file_hash
-            ))
-            self.conn.commit()
-        except sqlite3.IntegrityError:
-            pass
-    
-    def get_failed_calls(self, hours: int = 24) -> List[Dict]:
-        """Get failed calls from the last N hours"""
+        self.insert_failed_calls([record], file_hash)
+    
+    def get_failed_calls(self, hours: int = 24, limit: Optional[int] = None) -> List[Dict]:
+        """Get failed calls from the last N hours, most recent first"""
         cursor = self.conn.cursor()
         cutoff = datetime.now() - timedelta(hours=hours)
         
+        # LIMIT -1 means no limit in SQLite. dt_fmt is the report's short
+        # timestamp, formatted by SQLite rather than per row in Python.
         cursor.execute('''
-            SELECT * FROM failed_calls 
+            SELECT *, strftime('%m/%d %H:%M', date_time_origination) AS dt_fmt
+            FROM failed_calls 
             WHERE date_time_origination >= ?
             ORDER BY date_time_origination DESC
-        ''', (self._format_datetime_for_query(cutoff),))
+            LIMIT ?
+        ''', (self._format_datetime_for_query(cutoff), -1 if limit is None else limit))
         
         return [dict(row) for row in cursor.fetchall()]
     
@@ -415,61 +626,71 @@ class CDRDatabase:
         cutoff = datetime.now() - timedelta(hours=hours)
         cutoff_str = self._format_datetime_for_query(cutoff)
         
+        # Read the analysis window once; every aggregate below runs on this
+        # small in-memory copy instead of re-seeking the main table
+        cursor.execute('DROP TABLE IF EXISTS temp.report_window')
         cursor.execute('''
-            SELECT COUNT(*) as total FROM failed_calls 
+            CREATE TEMP TABLE report_window AS
+            SELECT date_time_origination, dest_cause_value, failure_reason,
+                   calling_party_number, original_called_party_number,
+                   orig_device_name
+            FROM failed_calls 
             WHERE date_time_origination >= ?
         ''', (cutoff_str,))
+        
+        cursor.execute('SELECT COUNT(*) as total FROM report_window')
         total = cursor.fetchone()['total']
         
         cursor.execute('''
             SELECT dest_cause_value, failure_reason, COUNT(*) as count 
-            FROM failed_calls 
-            WHERE date_time_origination >= ?
-            GROUP BY dest_cause_value 
-            ORDER BY count DESC
-        ''', (cutoff_str,))
+            FROM report_window 
+            GROUP BY dest_cause_value, failure_reason 
+            ORDER BY count DESC 
+            LIMIT 15
+        ''')
         by_cause = [dict(row) for row in cursor.fetchall()]
         
         cursor.execute('''
             SELECT strftime('%Y-%m-%d %H:00', date_time_origination) as hour, 
                    COUNT(*) as count 
-            FROM failed_calls 
-            WHERE date_time_origination >= ?
+            FROM report_window 
             GROUP BY hour 
             ORDER BY hour
-        ''', (cutoff_str,))
+        ''')
         by_hour = [dict(row) for row in cursor.fetchall()]
         
         cursor.execute('''
             SELECT calling_party_number, COUNT(*) as count 
-            FROM failed_calls 
-            WHERE date_time_origination >= ? AND calling_party_number != ''
+            FROM report_window 
+            WHERE calling_party_number != ''
             GROUP BY calling_party_number 
             ORDER BY count DESC 
             LIMIT 10
-        ''', (cutoff_str,))
+        ''')
         top_callers = [dict(row) for row in cursor.fetchall()]
         
         cursor.execute('''
             SELECT original_called_party_number, COUNT(*) as count 
-            FROM failed_calls 
-            WHERE date_time_origination >= ? AND original_called_party_number != ''
+            FROM report_window 
+            WHERE original_called_party_number != ''
             GROUP BY original_called_party_number 
             ORDER BY count DESC 
             LIMIT 10
-        ''', (cutoff_str,))
+        ''')
         top_destinations = [dict(row) for row in cursor.fetchall()]
         
         cursor.execute('''
             SELECT orig_device_name, COUNT(*) as count 
-            FROM failed_calls 
-            WHERE date_time_origination >= ? AND orig_device_name != ''
+            FROM report_window 
+            WHERE orig_device_name != ''
             GROUP BY orig_device_name 
             ORDER BY count DESC 
             LIMIT 10
-        ''', (cutoff_str,))
+        ''')
         top_devices = [dict(row) for row in cursor.fetchall()]
         
+        cursor.execute('DROP TABLE temp.report_window')
+        
         return {
             'total_failed_calls': total,
             'by_cause': by_cause,
@@ -512,30 +733,85 @@ class CDRFetcher:
         self.config = config
         self.sftp = None
         self.transport = None
+        self._sessions = []
+        self._idle_clients = queue.Queue()
+    
+    def _create_socket(self) -> socket.socket:
+        """Create a TCP connection to CUCM tuned for bulk transfers"""
+        last_error = None
+        for family, socktype, proto, _, address in socket.getaddrinfo(
+                self.config.cucm_host, self.config.cucm_port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                # Buffers must be sized before connect() to affect the TCP
+                # window. Leave at 0 to keep the OS auto-tuning.
+                if self.config.sftp_socket_buffer > 0:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                                    self.config.sftp_socket_buffer)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                    self.config.sftp_socket_buffer)
+                sock.connect(address)
+                return sock
+            except OSError as e:
+                sock.close()
+                last_error = e
+        raise last_error or OSError(f"Could not resolve {self.config.cucm_host}")
+    
+    def _open_session(self) -> Tuple[paramiko.Transport, paramiko.SFTPClient]:
+        """Open an authenticated SFTP session to CUCM"""
+        # A larger SSH window keeps prefetched reads from stalling on
+        # window adjustments; channels opened later inherit these sizes
+        transport = paramiko.Transport(
+            self._create_socket(),
+            default_window_size=SFTP_WINDOW_SIZE,
+            default_max_packet_size=SFTP_MAX_PACKET_SIZE
+        )
+        try:
+            transport.connect(
+                username=self.config.cucm_username,
+                password=self.config.cucm_password
+            )
+            # Idle pool sessions would otherwise be dropped by firewalls
+            # while other workers are still downloading
+            transport.set_keepalive(SFTP_KEEPALIVE_SECONDS)
+            return transport, paramiko.SFTPClient.from_transport(transport)
+        except Exception:
+            transport.close()
+            raise
     
     def connect(self):
-        """Establish SFTP connection to CUCM"""
+        """Establish SFTP connections to CUCM (one per download worker)"""
         logger.info(f"Connecting to CUCM at {self.config.cucm_host}...")
         
-        self.transport = paramiko.Transport((self.config.cucm_host, self.config.cucm_port))
-        self.transport.connect(
-            username=self.config.cucm_username,
-            password=self.config.cucm_password
-        )
-        self.sftp = paramiko.SFTPClient.from_transport(self.transport)
+        self.transport, self.sftp = self._open_session()
+        self._sessions = [(self.transport, self.sftp)]
+        
+        # Each SFTP session is latency-bound, so extra sessions let downloads
+        # overlap. The primary session is also used for listing.
+        for _ in range(max(1, self.config.sftp_workers) - 1):
+            try:
+                self._sessions.append(self._open_session())
+            except Exception as e:
+                logger.warning(f"Could not open additional SFTP session: {e}")
+                break
+        
+        for _, sftp in self._sessions:
+            self._idle_clients.put(sftp)
         
-        logger.info("Connected to CUCM successfully")
+        logger.info(f"Connected to CUCM successfully ({len(self._sessions)} SFTP sessions)")
     
     def disconnect(self):
-        """Close SFTP connection"""
-        if self.sftp:
-            self.sftp.close()
-        if self.transport:
-            self.transport.close()
+        """Close SFTP connections"""
+        for transport, sftp in self._sessions:
+            sftp.close()
+            transport.close()
+        self._sessions = []
+        self._idle_clients = queue.Queue()
         logger.info("Disconnected from CUCM")
     
-    def list_cdr_files(self, hours: int = 24) -> List[str]:
-        """List CDR files from the last N hours"""
+    def list_cdr_file_attrs(self, hours: int = 24) -> List[paramiko.SFTPAttributes]:
+        """List attributes of CDR files from the last N hours, sorted by name"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
         cdr_files = []
         
@@ -548,7 +824,7 @@ class CDRFetcher:
                 if filename.startswith('cdr_'):
                     mtime = datetime.fromtimestamp(file_attr.st_mtime)
                     if mtime >= cutoff_time:
-                        cdr_files.append(filename)
+                        cdr_files.append(file_attr)
             
             logger.info(f"Found {len(cdr_files)} CDR files from the last {hours} hours")
             
@@ -557,10 +833,21 @@ class CDRFetcher:
         except Exception as e:
             logger.error(f"Error listing CDR files: {e}")
         
-        return sorted(cdr_files)
+        return sorted(cdr_files, key=lambda file_attr: file_attr.filename)
+    
+    def list_cdr_files(self, hours: int = 24) -> List[str]:
+        """List CDR files from the last N hours"""
+        return [file_attr.filename for file_attr in self.list_cdr_file_attrs(hours)]
     
-    def download_file(self, remote_filename: str) -> Optional[str]:
-        """Download a single CDR file"""
+    def download_file(self, remote_filename: str,
+                      sftp: Optional[paramiko.SFTPClient] = None,
+                      remote_attr: Optional[paramiko.SFTPAttributes] = None) -> Optional[str]:
+        """Download a single CDR file.
+        
+        remote_attr is the file's entry from list_cdr_file_attrs; passing it
+        saves the stat round trips for the prefetch size and the mtime.
+        """
+        sftp = sftp or self.sftp
         local_dir = Path(self.config.local_cdr_dir)
         local_dir.mkdir(parents=True, exist_ok=True)
         
@@ -568,22 +855,55 @@ class CDRFetcher:
         local_path = local_dir / remote_filename
         
         try:
-            self.sftp.get(remote_path, str(local_path))
+            # Read large blocks with prefetch so many requests stay in flight
+            with sftp.open(remote_path, 'rb') as remote_file, \
+                    open(local_path, 'wb') as local_file:
+                if remote_attr is None:
+                    remote_attr = remote_file.stat()
+                remote_file.set_pipelined(True)
+                remote_file.prefetch(remote_attr.st_size)
+                shutil.copyfileobj(remote_file, local_file, SFTP_READ_BLOCK_SIZE)
+            # Keep the server's mtime so processed-file fingerprints stay stable
+            os.utime(local_path, (remote_attr.st_atime, remote_attr.st_mtime))
             logger.debug(f"Downloaded: {remote_filename}")
             return str(local_path)
         except Exception as e:
             logger.error(f"Error downloading {remote_filename}: {e}")
             return None
     
-    def download_cdr_files(self, hours: int = 24) -> List[str]:
-        """Download all CDR files from the last N hours"""
-        files_to_download = self.list_cdr_files(hours)
-        downloaded_files = []
+    def _download_with_idle_client(self, file_attr: paramiko.SFTPAttributes) -> Optional[str]:
+        """Download a file using whichever SFTP session is free"""
+        sftp = self._idle_clients.get()
+        try:
+            return self.download_file(file_attr.filename, sftp, file_attr)
+        finally:
+            self._idle_clients.put(sftp)
+    
+    def download_cdr_files(self, hours: int = 24,
+                           is_processed: Optional[Callable[[str, int, int], bool]] = None
+                           ) -> List[str]:
+        """Download all CDR files from the last N hours.
+        
+        If is_processed is given it is called with each file's name, size
+        and mtime, and files it reports as already processed are not
+        downloaded.
+        """
+        files_to_download = []
+        skipped = 0
+        for file_attr in self.list_cdr_file_attrs(hours):
+            if is_processed and is_processed(file_attr.filename, file_attr.st_size,
+                                             int(file_attr.st_mtime)):
+                skipped += 1
+                continue
+            files_to_download.append(file_attr)
+        
+        if skipped:
+            logger.info(f"Skipping {skipped} CDR files already processed")
         
-        for filename in files_to_download:
-            local_path = self.download_file(filename)
-            if local_path:
-                downloaded_files.append(local_path)
+        workers = max(1, len(self._sessions))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._download_with_idle_client, files_to_download)
+            downloaded_files = [path for path in results if path]
         
         logger.info(f"Downloaded {len(downloaded_files)} CDR files")
         return downloaded_files
@@ -593,6 +913,23 @@ class CDRFetcher:
 # CDR PARSING
 # =============================================================================
 
+class _HashingReader(io.RawIOBase):
+    """Binary reader that feeds every byte it returns into a hash object"""
+    
+    def __init__(self, raw, hasher):
+        self._raw = raw
+        self._hasher = hasher
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        if count:
+            self._hasher.update(memoryview(buffer)[:count])
+        return count
+
+
 class CDRParser:
     """Parses CUCM CDR flat files"""
     
@@ -659,6 +996,17 @@ class CDRParser:
         102: 'huntPilotPartition',
     }
     
+    # Reverse lookup so field access by name does not scan CDR_FIELDS
+    CDR_FIELD_INDEX = {name: idx for idx, name in CDR_FIELDS.items()}
+    
+    # Pulls the columns the failure test needs out of a row in one C call
+    _FAILURE_COLUMNS = itemgetter(
+        CDR_FIELD_INDEX['duration'],
+        CDR_FIELD_INDEX['destCause_value'],
+        CDR_FIELD_INDEX['origCause_value'],
+        CDR_FIELD_INDEX['dateTimeOrigination'],
+    )
+    
     def __init__(self):
         pass
     
@@ -689,127 +1037,468 @@ class CDRParser:
     
     def _parse_timestamp(self, epoch_str: str) -> Optional[datetime]:
         """Convert epoch timestamp to datetime"""
-        try:
-            epoch = int(epoch_str) if epoch_str else 0
-            if epoch > 0:
-                return datetime.fromtimestamp(epoch)
+        # Failed calls never connect, so dateTimeConnect is almost always "0"
+        if not epoch_str or epoch_str == '0':
             return None
-        except (ValueError, TypeError):
+        try:
+            epoch = int(epoch_str)
+            return datetime.fromtimestamp(epoch) if epoch > 0 else None
+        except (ValueError, TypeError, OverflowError, OSError):
             return None
     
     def _get_field(self, row: List[str], field_name: str) -> str:
         """Get a field value from a CDR row by field name"""
-        for idx, name in self.CDR_FIELDS.items():
-            if name == field_name and idx < len(row):
-                return row[idx].strip() if row[idx] else ""
+        idx = self.CDR_FIELD_INDEX.get(field_name)
+        if idx is not None and idx < len(row) and row[idx]:
+            return row[idx].strip()
         return ""
     
     def _get_field_int(self, row: List[str], field_name: str) -> int:
         """Get an integer field value from a CDR row"""
         return self._safe_int(self._get_field(row, field_name))
     
+    def _build_record(self, row: List[str], record_type: int = 1) -> CDRRecord:
+        """Build a CDRRecord from a raw CDR row"""
+        return CDRRecord(
+            cdr_record_type=record_type,
+            global_call_id=f"{self._get_field(row, 'globalCallID_callManagerId')}-{self._get_field(row, 'globalCallID_callId')}",
+            date_time_origination=self._parse_timestamp(self._get_field(row, 'dateTimeOrigination')),
+            date_time_connect=self._parse_timestamp(self._get_field(row, 'dateTimeConnect')),
+            date_time_disconnect=self._parse_timestamp(self._get_field(row, 'dateTimeDisconnect')),
+            calling_party_number=self._get_field(row, 'callingPartyNumber'),
+            original_called_party_number=self._get_field(row, 'originalCalledPartyNumber'),
+            final_called_party_number=self._get_field(row, 'finalCalledPartyNumber'),
+            last_redirect_dn=self._get_field(row, 'lastRedirectDn'),
+            orig_cause_value=self._get_field_int(row, 'origCause_value'),
+            dest_cause_value=self._get_field_int(row, 'destCause_value'),
+            duration=self._get_field_int(row, 'duration'),
+            orig_device_name=self._get_field(row, 'origDeviceName'),
+            dest_device_name=self._get_field(row, 'destDeviceName'),
+            orig_ip_addr=self._int_to_ip(self._get_field(row, 'origIpAddr')),
+            dest_ip_addr=self._int_to_ip(self._get_field(row, 'destIpAddr')),
+            calling_party_number_partition=self._get_field(row, 'callingPartyNumberPartition'),
+            original_called_party_number_partition=self._get_field(row, 'originalCalledPartyNumberPartition'),
+            final_called_party_number_partition=self._get_field(row, 'finalCalledPartyNumberPartition'),
+            hunt_pilot_dn=self._get_field(row, 'huntPilotDN'),
+            hunt_pilot_partition=self._get_field(row, 'huntPilotPartition'),
+        )
+    
+    def _is_failed_row(self, row: List[str]) -> bool:
+        """Apply the CDRRecord.is_failed test directly to raw CDR columns"""
+        if self._get_field_int(row, 'duration') != 0:
+            return False
+        return (self._get_field_int(row, 'destCause_value') not in SUCCESS_CODES or
+                self._get_field_int(row, 'origCause_value') not in SUCCESS_CODES)
+    
+    def _open_cdr_text(self, source, file_path: str) -> io.TextIOWrapper:
+        """Wrap a binary CDR stream as text, decompressing .gz files"""
+        if file_path.endswith('.gz'):
+            source = gzip.GzipFile(fileobj=source)
+        return io.TextIOWrapper(source, encoding='utf-8', errors='ignore')
+    
+    def _iter_call_rows(self, text_file: io.TextIOBase,
+                        counts: Optional[Dict] = None) -> Iterator[List[str]]:
+        """Yield the call record rows (type 1) of an open CDR text stream.
+        
+        If counts is given, counts['rows'] is kept up to date with the
+        number of CSV rows read, including skipped ones. The caller owns
+        text_file, so it stays open after the rows run out.
+        """
+        for row in csv.reader(text_file):
+            if counts is not None:
+                counts['rows'] += 1
+            
+            if not row or len(row) < 50:
+                continue
+            
+            if self._safe_int(row[0]) != 1:
+                continue
+            
+            yield row
+    
+    def _row_to_record(self, row: List[str]) -> Optional[CDRRecord]:
+        """Build a CDRRecord from a call row, or None if it has no valid origination time"""
+        try:
+            record = self._build_record(row)
+        except Exception as e:
+            logger.debug(f"Error parsing row: {e}")
+            return None
+        return record if record.date_time_origination else None
+    
+    def iter_records(self, file_path: str, totals: Optional[Dict] = None) -> Iterator[CDRRecord]:
+        """Yield a CDRRecord for each call record in a CDR file.
+        
+        Rows are read lazily, so a whole file is never held in memory.
+        If totals is given, totals['records'] is set to the number of
+        rows read once the generator finishes.
+        """
+        counts = {'rows': 0}
+        
+        try:
+            with open(file_path, 'rb') as raw_file:
+                text_file = self._open_cdr_text(raw_file, file_path)
+                for row in self._iter_call_rows(text_file, counts):
+                    record = self._row_to_record(row)
+                    if record is not None:
+                        yield record
+                        
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+        finally:
+            if totals is not None:
+                totals['records'] = counts['rows']
+    
     def parse_file(self, file_path: str) -> Tuple[List[CDRRecord], int]:
         """Parse a CDR file and return list of CDRRecord objects"""
-        records = []
-        total_rows = 0
+        totals = {}
+        records = list(self.iter_records(file_path, totals))
+        return records, totals['records']
+    
+    def iter_failed_calls(self, file_path: str, totals: Optional[Dict] = None,
+                          hasher=None) -> Iterator[CDRRecord]:
+        """Stream the failed calls in a CDR file.
+        
+        The failure test runs on the raw columns, so a CDRRecord is only
+        built for failed rows and nothing else is kept in memory. If totals
+        is given, totals['records'] holds the number of call records seen
+        once the stream is exhausted. If a hashlib hasher is given, the raw
+        file bytes are hashed during the same read and totals['file_hash']
+        holds the hex digest (only when the whole file was read).
+        """
+        call_count = 0
+        file_hash = None
+        failure_columns = self._FAILURE_COLUMNS
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.reader(f)
+            with open(file_path, 'rb') as raw_file:
+                source = raw_file
+                if hasher is not None:
+                    source = io.BufferedReader(_HashingReader(raw_file, hasher), FILE_READ_BLOCK_SIZE)
+                text_file = self._open_cdr_text(source, file_path)
                 
-                for row in reader:
-                    total_rows += 1
-                    
-                    if not row or len(row) < 50:
-                        continue
-                    
-                    record_type = self._safe_int(row[0] if row else "0")
-                    if record_type != 1:
-                        continue
-                    
+                for row in self._iter_call_rows(text_file):
+                    # Rows that are not failed calls count as calls under the
+                    # same rule as records: a valid origination timestamp
                     try:
-                        record = CDRRecord(
-                            cdr_record_type=record_type,
-                            global_call_id=f"{self._get_field(row, 'globalCallID_callManagerId')}-{self._get_field(row, 'globalCallID_callId')}",
-                            date_time_origination=self._parse_timestamp(self._get_field(row, 'dateTimeOrigination')),
-                            date_time_connect=self._parse_timestamp(self._get_field(row, 'dateTimeConnect')),
-                            date_time_disconnect=self._parse_timestamp(self._get_field(row, 'dateTimeDisconnect')),
-                            calling_party_number=self._get_field(row, 'callingPartyNumber'),
-                            original_called_party_number=self._get_field(row, 'originalCalledPartyNumber'),
-                            final_called_party_number=self._get_field(row, 'finalCalledPartyNumber'),
-                            last_redirect_dn=self._get_field(row, 'lastRedirectDn'),
-                            orig_cause_value=self._get_field_int(row, 'origCause_value'),
-                            dest_cause_value=self._get_field_int(row, 'destCause_value'),
-                            duration=self._get_field_int(row, 'duration'),
-                            orig_device_name=self._get_field(row, 'origDeviceName'),
-                            dest_device_name=self._get_field(row, 'destDeviceName'),
-                            orig_ip_addr=self._int_to_ip(self._get_field(row, 'origIpAddr')),
-                            dest_ip_addr=self._int_to_ip(self._get_field(row, 'destIpAddr')),
-                            calling_party_number_partition=self._get_field(row, 'callingPartyNumberPartition'),
-                            original_called_party_number_partition=self._get_field(row, 'originalCalledPartyNumberPartition'),
-                            final_called_party_number_partition=self._get_field(row, 'finalCalledPartyNumberPartition'),
-                            hunt_pilot_dn=self._get_field(row, 'huntPilotDN'),
-                            hunt_pilot_partition=self._get_field(row, 'huntPilotPartition'),
-                        )
-                        
-                        if record.date_time_origination:
-                            records.append(record)
-                            
-                    except Exception as e:
-                        logger.debug(f"Error parsing row: {e}")
-                        continue
+                        duration, dest_cause, orig_cause, origination = failure_columns(row)
+                        if int(duration or 0) != 0 or (
+                                int(dest_cause or 0) in SUCCESS_CODES and
+                                int(orig_cause or 0) in SUCCESS_CODES):
+                            if self._parse_timestamp(origination) is not None:
+                                call_count += 1
+                            continue
+                    except (IndexError, ValueError):
+                        # Short rows or padded values take the slower lookup
+                        if not self._is_failed_row(row):
+                            if self._parse_timestamp(self._get_field(row, 'dateTimeOrigination')) is not None:
+                                call_count += 1
+                            continue
+                    
+                    record = self._row_to_record(row)
+                    if record is not None:
+                        call_count += 1
+                        yield record
+                
+                if hasher is not None:
+                    # Hash any trailing bytes the decoder did not need
+                    while source.read(FILE_READ_BLOCK_SIZE):
+                        pass
+                    file_hash = hasher.hexdigest()
                         
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
-        
-        return records, total_rows
+        finally:
+            if totals is not None:
+                totals['records'] = call_count
+                if hasher is not None:
+                    totals['file_hash'] = file_hash
     
     def get_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file for duplicate detection (FIPS compliant)"""
-        file_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                file_hash.update(chunk)
-        return file_hash.hexdigest()
+            return hashlib.file_digest(f, FILE_HASH_ALGORITHM).hexdigest()
+
+
+def _parse_failed_calls(file_path: str) -> Tuple[List[CDRRecord], int, Optional[str]]:
+    """Process pool entry point: hash and parse one CDR file in a single read.
+    
+    Returns only the failed calls, the number of call records, and the
+    file's SHA256 hash (None if the file could not be read completely).
+    """
+    totals = {}
+    failed_records = list(CDRParser().iter_failed_calls(file_path, totals, hashlib.new(FILE_HASH_ALGORITHM)))
+    return failed_records, totals['records'], totals['file_hash']
 
 
 # =============================================================================
 # REPORT GENERATION
 # =============================================================================
 
+def _trunc(text: str, length: int) -> str:
+    """Shorten text to length characters, marking the cut with '...'"""
+    return text[:length] + '...' if len(text) > length else text
+
+
+def _fmt_call(call: Dict) -> List[str]:
+    """Format a failed call row from get_failed_calls for the PDF detail table"""
+    return [
+        call.get('dt_fmt') or 'N/A',
+        (call.get('calling_party_number') or 'Unknown')[:12],
+        (call.get('original_called_party_number') or 'Unknown')[:12],
+        str(call.get('dest_cause_value', 0)),
+        (call.get('orig_device_name') or 'Unknown')[:18],
+        (call.get('orig_ip_addr') or '')[:15]
+    ]
+
+
+# PDF report colors
+_C_HEADER = colors.HexColor('#2c3e50')
+_C_SUBHEADER = colors.HexColor('#34495e')
+_C_SECTION = colors.HexColor('#1a5276')
+_C_SUMMARY_BG = colors.HexColor('#ecf0f1')
+_C_ROW_ALT = colors.HexColor('#f8f9fa')
+_C_GRID = colors.HexColor('#bdc3c7')
+
+# HTML email report fragments, joined by ReportGenerator.render_html_report
+_HTML_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+                h1 { color: #2c3e50; text-align: center; margin-bottom: 5px; }
+                h2 { color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 10px; margin-top: 30px; }
+                .subtitle { text-align: center; color: #7f8c8d; margin-bottom: 30px; }
+                .summary-box { display: flex; justify-content: space-around; background-color: #ecf0f1; padding: 20px; border-radius: 8px; margin: 20px 0; }
+                .stat { text-align: center; }
+                .stat-value { font-size: 36px; font-weight: bold; color: #c0392b; }
+                .stat-label { font-size: 14px; color: #7f8c8d; }
+                table { width: 100%; border-collapse: collapse; margin: 15px 0; }
+                th { background-color: #34495e; color: white; padding: 12px 8px; text-align: left; font-size: 13px; }
+                td { padding: 10px 8px; border-bottom: 1px solid #ecf0f1; font-size: 12px; }
+                tr:nth-child(even) { background-color: #f8f9fa; }
+                .cause-code { font-weight: bold; color: #e74c3c; }
+                .footer { text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ecf0f1; color: #95a5a6; font-size: 12px; }
+                .alert { background-color: #fadbd8; border-left: 4px solid #e74c3c; padding: 15px; margin: 20px 0; }
+            </style>
+        </head>
+"""
+
+_HTML_SUMMARY_TMPL = """        <body>
+            <div class="container">
+                <h1>CUCM Failed Calls Report</h1>
+                <p class="subtitle">{cluster_name} | Generated: {generated}</p>
+                
+                <div class="summary-box">
+                    <div class="stat">
+                        <div class="stat-value">{total}</div>
+                        <div class="stat-label">Total Failed Calls</div>
+                    </div>
+                    <div class="stat">
+                        <div class="stat-value">{hours}h</div>
+                        <div class="stat-label">Analysis Period</div>
+                    </div>
+                </div>
+        """
+
+_HTML_ALERT_TMPL = """
+                <div class="alert">
+                    High Failure Count Alert: {total} failed calls detected.
+                </div>
+            """
+
+_HTML_CAUSE_TABLE_HEAD = """
+                <h2>Failures by Cause Code</h2>
+                <table>
+                    <tr><th>Code</th><th>Reason</th><th>Count</th></tr>
+            """
+
+_HTML_CAUSE_ROW_TMPL = """
+                    <tr>
+                        <td class="cause-code">{}</td>
+                        <td>{}</td>
+                        <td>{}</td>
+                    </tr>
+                """
+
+_HTML_DEVICE_TABLE_HEAD = """
+                <h2>Top Devices with Failures</h2>
+                <table>
+                    <tr><th>Device Name</th><th>Failed Calls</th></tr>
+            """
+
+_HTML_DEVICE_ROW_TMPL = """
+                    <tr>
+                        <td>{}</td>
+                        <td>{}</td>
+                    </tr>
+                """
+
+_HTML_FOOT = """
+                <div class="footer">
+                    <p>Generated by CUCM CDR Failed Call Reporter</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+
 class ReportGenerator:
     """Generates PDF and HTML reports for failed calls"""
     
+    # Number of most recent failed calls listed in the PDF detail table
+    DETAIL_ROW_LIMIT = 50
+    
+    # Table styles are constant, so build them once and share them
+    _SUMMARY_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _C_HEADER),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 1), (-1, -1), 15),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 15),
+        ('BACKGROUND', (0, 1), (-1, -1), _C_SUMMARY_BG),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white),
+    ])
+    
+    _CAUSE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _C_SUBHEADER),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+        ('ALIGN', (2, 1), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _C_ROW_ALT]),
+        ('GRID', (0, 0), (-1, -1), 0.5, _C_GRID),
+    ])
+    
+    _DEVICE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _C_SUBHEADER),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _C_ROW_ALT]),
+        ('GRID', (0, 0), (-1, -1), 0.5, _C_GRID),
+    ])
+    
+    _DETAIL_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _C_HEADER),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('TOPPADDING', (0, 1), (-1, -1), 3),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _C_ROW_ALT]),
+        ('GRID', (0, 0), (-1, -1), 0.5, _C_GRID),
+    ])
+    
+    # Column widths; the detail table totals ~7.5 inches to fit letter
+    # size with half-inch margins, including the Origin IP column
+    _COLW_SUMMARY = (2.5*inch, 2.5*inch, 2.5*inch)
+    _COLW_CAUSE = (0.8*inch, 4*inch, 0.8*inch, 0.9*inch)
+    _COLW_DEVICE = (5*inch, 1.5*inch)
+    _COLW_DETAIL = (0.9*inch, 1.0*inch, 1.0*inch, 0.5*inch, 1.9*inch, 1.2*inch)
+    
+    # Stylesheet with the custom paragraph styles, built on first use
+    _stylesheet = None
+    
     def __init__(self, config: Config):
         self.config = config
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = self._get_stylesheet()
+        if RL_ACCEL_AVAILABLE:
+            logger.debug("rl_accel C extension active")
+        else:
+            logger.debug("rl_accel not installed; PDF table layout will be slower")
     
-    def _setup_custom_styles(self):
+    @classmethod
+    def _get_stylesheet(cls):
+        """Get the shared stylesheet, setting up custom paragraph styles once"""
+        if cls._stylesheet is None:
+            styles = getSampleStyleSheet()
+            cls._setup_custom_styles(styles)
+            cls._stylesheet = styles
+        return cls._stylesheet
+    
+    @staticmethod
+    def _setup_custom_styles(styles):
         """Setup custom paragraph styles"""
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CenterTitle',
-            parent=self.styles['Title'],
+            parent=styles['Title'],
             alignment=TA_CENTER,
             spaceAfter=30
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             spaceBefore=20,
             spaceAfter=10,
-            textColor=colors.HexColor('#1a5276')
+            textColor=_C_SECTION
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SubHeader',
-            parent=self.styles['Heading3'],
+            parent=styles['Heading3'],
             spaceBefore=15,
             spaceAfter=8
         ))
     
+    def build_model(self, stats: Dict, failed_calls: List[Dict],
+                    run_ts: Optional[datetime] = None) -> ReportModel:
+        """Format statistics and detail rows once for both report renderers"""
+        run_ts = run_ts or datetime.now()
+        total = stats['total_failed_calls'] or 1
+        
+        return ReportModel(
+            cluster_name=self.config.cluster_name,
+            generated=run_ts.strftime('%Y-%m-%d %H:%M:%S'),
+            generated_short=run_ts.strftime('%Y-%m-%d %H:%M'),
+            total_failed_calls=stats['total_failed_calls'],
+            analysis_period_hours=stats['analysis_period_hours'],
+            causes=[
+                CauseRow(
+                    code=item['dest_cause_value'],
+                    reason=item['failure_reason'],
+                    reason_short=_trunc(item['failure_reason'], 40),
+                    count=item['count'],
+                    pct=f"{(item['count'] / total) * 100:.1f}%"
+                )
+                for item in stats.get('by_cause') or []
+            ],
+            devices=[
+                DeviceRow(name=item['orig_device_name'], count=item['count'])
+                for item in stats.get('top_devices') or []
+            ],
+            detail_rows=[_fmt_call(call) for call in failed_calls]
+        )
+    
     def generate_pdf_report(self, stats: Dict, failed_calls: List[Dict], 
-                           output_path: str) -> str:
-        """Generate a PDF report"""
+                           output_path: str, run_ts: Optional[datetime] = None) -> str:
+        """Generate a PDF report (every call in failed_calls is listed in the detail table)"""
+        return self.render_pdf_report(self.build_model(stats, failed_calls, run_ts), output_path)
+    
+    def generate_html_report(self, stats: Dict, failed_calls: List[Dict],
+                             run_ts: Optional[datetime] = None) -> str:
+        """Generate an HTML report for email body"""
+        return self.render_html_report(self.build_model(stats, failed_calls, run_ts))
+    
+    def render_pdf_report(self, model: ReportModel, output_path: str) -> str:
+        """Write a report model out as a PDF"""
         doc = SimpleDocTemplate(
             output_path,
             pagesize=letter,
@@ -826,15 +1515,15 @@ class ReportGenerator:
             self.styles['CenterTitle']
         ))
         story.append(Paragraph(
-            f"{self.config.cluster_name}",
+            f"{model.cluster_name}",
             self.styles['Normal']
         ))
         story.append(Paragraph(
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Generated: {model.generated}",
             self.styles['Normal']
         ))
         story.append(Paragraph(
-            f"Analysis Period: Last {stats['analysis_period_hours']} hours",
+            f"Analysis Period: Last {model.analysis_period_hours} hours",
             self.styles['Normal']
         ))
         story.append(Spacer(1, 20))
@@ -844,128 +1533,63 @@ class ReportGenerator:
         summary_data = [
             ['Total Failed Calls', 'Analysis Period', 'Report Generated'],
             [
-                str(stats['total_failed_calls']),
-                f"{stats['analysis_period_hours']} hours",
-                datetime.now().strftime('%Y-%m-%d %H:%M')
+                str(model.total_failed_calls),
+                f"{model.analysis_period_hours} hours",
+                model.generated_short
             ]
         ]
         
-        summary_table = Table(summary_data, colWidths=[2.5*inch, 2.5*inch, 2.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 1), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 15),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.white),
-        ]))
+        summary_table = Table(summary_data, colWidths=self._COLW_SUMMARY)
+        summary_table.setStyle(self._SUMMARY_STYLE)
         story.append(summary_table)
         story.append(Spacer(1, 20))
         
-        if stats['by_cause']:
+        if model.causes:
             story.append(Paragraph("Failures by Cause Code", self.styles['SectionHeader']))
             
             cause_data = [['Cause Code', 'Reason', 'Count', 'Percentage']]
-            total = stats['total_failed_calls'] or 1
-            
-            for item in stats['by_cause'][:15]:
-                pct = (item['count'] / total) * 100
-                cause_data.append([
-                    str(item['dest_cause_value']),
-                    item['failure_reason'][:40] + '...' if len(item['failure_reason']) > 40 else item['failure_reason'],
-                    str(item['count']),
-                    f"{pct:.1f}%"
-                ])
+            cause_data.extend([
+                [str(row.code), row.reason_short, str(row.count), row.pct]
+                for row in model.causes
+            ])
             
-            cause_table = Table(cause_data, colWidths=[0.8*inch, 4*inch, 0.8*inch, 0.9*inch])
-            cause_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-                ('ALIGN', (2, 1), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-            ]))
+            cause_table = Table(cause_data, colWidths=self._COLW_CAUSE)
+            cause_table.setStyle(self._CAUSE_STYLE)
             story.append(cause_table)
             story.append(Spacer(1, 15))
         
-        if stats['top_devices']:
+        if model.devices:
             story.append(Paragraph("Top Devices with Failures", self.styles['SectionHeader']))
             
             device_data = [['Device Name', 'Failed Calls']]
-            for item in stats['top_devices'][:10]:
-                device_data.append([item['orig_device_name'], str(item['count'])])
+            device_data.extend([[row.name, str(row.count)] for row in model.devices])
             
-            device_table = Table(device_data, colWidths=[5*inch, 1.5*inch])
-            device_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-            ]))
+            device_table = Table(device_data, colWidths=self._COLW_DEVICE)
+            device_table.setStyle(self._DEVICE_STYLE)
             story.append(device_table)
         
         story.append(PageBreak())
         
         story.append(Paragraph("Recent Failed Calls Detail", self.styles['SectionHeader']))
         story.append(Paragraph(
-            f"Showing most recent {min(50, len(failed_calls))} failed calls",
+            f"Showing most recent {len(model.detail_rows)} of {model.total_failed_calls} failed calls",
             self.styles['Normal']
         ))
         story.append(Spacer(1, 10))
         
-        if failed_calls:
+        if model.detail_rows:
             # Header row with Origin IP column
             detail_data = [['Time', 'From', 'To', 'Cause', 'Device', 'Origin IP']]
+            detail_data.extend(model.detail_rows)
             
-            for call in failed_calls[:50]:
-                dt = call.get('date_time_origination', '')
-                if isinstance(dt, str):
-                    dt_str = dt[:16] if dt else 'N/A'
-                else:
-                    dt_str = dt.strftime('%m/%d %H:%M') if dt else 'N/A'
-                
-                detail_data.append([
-                    dt_str,
-                    (call.get('calling_party_number', '') or 'Unknown')[:12],
-                    (call.get('original_called_party_number', '') or 'Unknown')[:12],
-                    str(call.get('dest_cause_value', 0)),
-                    (call.get('orig_device_name', '') or 'Unknown')[:18],
-                    (call.get('orig_ip_addr', '') or '')[:15]
-                ])
-            
-            # Adjusted column widths to fit Origin IP (total ~7.5 inches for letter size with margins)
-            detail_table = Table(detail_data, colWidths=[0.9*inch, 1.0*inch, 1.0*inch, 0.5*inch, 1.9*inch, 1.2*inch])
-            detail_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('ALIGN', (3, 1), (3, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('TOPPADDING', (0, 1), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bdc3c7')),
-            ]))
+            # The detail list can run past one page; repeat the header row
+            # on each continuation page
+            detail_table = LongTable(
+                detail_data,
+                colWidths=self._COLW_DETAIL,
+                repeatRows=1
+            )
+            detail_table.setStyle(self._DETAIL_STYLE)
             story.append(detail_table)
         
         doc.build(story)
@@ -973,97 +1597,37 @@ class ReportGenerator:
         
         return output_path
     
-    def generate_html_report(self, stats: Dict, failed_calls: List[Dict]) -> str:
-        """Generate an HTML report for email body"""
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                h1 {{ color: #2c3e50; text-align: center; margin-bottom: 5px; }}
-                h2 {{ color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 10px; margin-top: 30px; }}
-                .subtitle {{ text-align: center; color: #7f8c8d; margin-bottom: 30px; }}
-                .summary-box {{ display: flex; justify-content: space-around; background-color: #ecf0f1; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-                .stat {{ text-align: center; }}
-                .stat-value {{ font-size: 36px; font-weight: bold; color: #c0392b; }}
-                .stat-label {{ font-size: 14px; color: #7f8c8d; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 15px 0; }}
-                th {{ background-color: #34495e; color: white; padding: 12px 8px; text-align: left; font-size: 13px; }}
-                td {{ padding: 10px 8px; border-bottom: 1px solid #ecf0f1; font-size: 12px; }}
-                tr:nth-child(even) {{ background-color: #f8f9fa; }}
-                .cause-code {{ font-weight: bold; color: #e74c3c; }}
-                .footer {{ text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ecf0f1; color: #95a5a6; font-size: 12px; }}
-                .alert {{ background-color: #fadbd8; border-left: 4px solid #e74c3c; padding: 15px; margin: 20px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>CUCM Failed Calls Report</h1>
-                <p class="subtitle">{self.config.cluster_name} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                
-                <div class="summary-box">
-                    <div class="stat">
-                        <div class="stat-value">{stats['total_failed_calls']}</div>
-                        <div class="stat-label">Total Failed Calls</div>
-                    </div>
-                    <div class="stat">
-                        <div class="stat-value">{stats['analysis_period_hours']}h</div>
-                        <div class="stat-label">Analysis Period</div>
-                    </div>
-                </div>
-        """
-        
-        if stats['total_failed_calls'] > 100:
-            html += f"""
-                <div class="alert">
-                    High Failure Count Alert: {stats['total_failed_calls']} failed calls detected.
-                </div>
-            """
-        
-        if stats.get('by_cause'):
-            html += """
-                <h2>Failures by Cause Code</h2>
-                <table>
-                    <tr><th>Code</th><th>Reason</th><th>Count</th></tr>
-            """
-            for item in stats['by_cause'][:10]:
-                html += f"""
-                    <tr>
-                        <td class="cause-code">{item['dest_cause_value']}</td>
-                        <td>{item['failure_reason']}</td>
-                        <td>{item['count']}</td>
-                    </tr>
-                """
-            html += "</table>"
-        
-        if stats.get('top_devices'):
-            html += """
-                <h2>Top Devices with Failures</h2>
-                <table>
-                    <tr><th>Device Name</th><th>Failed Calls</th></tr>
-            """
-            for item in stats['top_devices'][:10]:
-                html += f"""
-                    <tr>
-                        <td>{item['orig_device_name']}</td>
-                        <td>{item['count']}</td>
-                    </tr>
-                """
-            html += "</table>"
-        
-        html += f"""
-                <div class="footer">
-                    <p>Generated by CUCM CDR Failed Call Reporter</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+    def render_html_report(self, model: ReportModel) -> str:
+        """Render a report model as the HTML email body"""
+        parts = [_HTML_HEAD, _HTML_SUMMARY_TMPL.format(
+            cluster_name=model.cluster_name,
+            generated=model.generated,
+            total=model.total_failed_calls,
+            hours=model.analysis_period_hours
+        )]
+        
+        if model.total_failed_calls > 100:
+            parts.append(_HTML_ALERT_TMPL.format(total=model.total_failed_calls))
+        
+        if model.causes:
+            parts.append(_HTML_CAUSE_TABLE_HEAD)
+            parts.extend([
+                _HTML_CAUSE_ROW_TMPL.format(row.code, row.reason, row.count)
+                for row in model.causes[:10]
+            ])
+            parts.append("</table>")
+        
+        if model.devices:
+            parts.append(_HTML_DEVICE_TABLE_HEAD)
+            parts.extend([
+                _HTML_DEVICE_ROW_TMPL.format(row.name, row.count)
+                for row in model.devices[:10]
+            ])
+            parts.append("</table>")
+        
+        parts.append(_HTML_FOOT)
+        
+        return "".join(parts)
 
 
 # =============================================================================
@@ -1071,12 +1635,52 @@ class ReportGenerator:
 # =============================================================================
 
 class EmailSender:
-    """Handles email delivery of reports"""
+    """Handles email delivery of reports.
+    
+    Used as a context manager, one SMTP connection is opened on the first
+    send and reused until the block exits. Otherwise each send_report
+    call connects and disconnects on its own.
+    """
     
     def __init__(self, config: Config):
         self.config = config
+        self._server = None
+        self._keep_open = False
+    
+    def __enter__(self):
+        self._keep_open = True
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._keep_open = False
+        self.close()
+    
+    def _get_server(self) -> smtplib.SMTP:
+        """Get the SMTP connection, connecting and authenticating if needed"""
+        if self._server is None:
+            server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
+            try:
+                if self.config.smtp_use_tls:
+                    server.starttls()
+                if self.config.smtp_username and self.config.smtp_password:
+                    server.login(self.config.smtp_username, self.config.smtp_password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+        return self._server
+    
+    def close(self):
+        """Close the SMTP connection if one is open"""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+            self._server = None
     
-    def send_report(self, html_body: str, pdf_path: Optional[str] = None) -> bool:
+    def send_report(self, html_body: str, pdf_path: Optional[str] = None,
+                    run_ts: Optional[datetime] = None) -> bool:
         """Send the report via email"""
         
         if not self.config.email_to:
@@ -1084,48 +1688,45 @@ class EmailSender:
             return False
         
         try:
-            msg = MIMEMultipart('alternative')
+            msg = EmailMessage()
             msg['Subject'] = self.config.email_subject.format(
-                date=datetime.now().strftime('%Y-%m-%d')
+                date=(run_ts or datetime.now()).strftime('%Y-%m-%d')
             )
             msg['From'] = self.config.email_from
             msg['To'] = ', '.join(self.config.email_to)
             
-            msg.attach(MIMEText("Please view this email in an HTML-capable client.", 'plain'))
-            msg.attach(MIMEText(html_body, 'html'))
+            msg.set_content("Please view this email in an HTML-capable client.")
+            msg.add_alternative(html_body, subtype='html')
             
             if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, 'rb') as f:
-                    pdf_attachment = MIMEApplication(f.read(), _subtype='pdf')
-                    pdf_attachment.add_header(
-                        'Content-Disposition', 
-                        'attachment', 
-                        filename=os.path.basename(pdf_path)
-                    )
-                    msg.attach(pdf_attachment)
-            
-            if self.config.smtp_use_tls:
-                server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
-            
-            if self.config.smtp_username and self.config.smtp_password:
-                server.login(self.config.smtp_username, self.config.smtp_password)
+                pdf_data = Path(pdf_path).read_bytes()
+                msg.add_attachment(
+                    pdf_data,
+                    maintype='application',
+                    subtype='pdf',
+                    filename=os.path.basename(pdf_path)
+                )
+                # The message now holds the base64 copy; drop the raw bytes
+                # so they are not kept alive through the SMTP send
+                del pdf_data
             
-            server.sendmail(
-                self.config.email_from,
-                self.config.email_to,
-                msg.as_string()
+            self._get_server().send_message(
+                msg,
+                from_addr=self.config.email_from,
+                to_addrs=self.config.email_to
             )
-            server.quit()
             
             logger.info(f"Report emailed to: {', '.join(self.config.email_to)}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
+            # A failed connection can't be reused; reconnect on the next send
+            self.close()
             return False
+        finally:
+            if not self._keep_open:
+                self.close()
 
 
 # =============================================================================
@@ -1142,51 +1743,127 @@ class CDRReporter:
         self.report_gen = ReportGenerator(config)
         self.email_sender = EmailSender(config)
     
-    def fetch_and_process_cdr_files(self) -> Tuple[int, int]:
-        """Fetch CDR files from CUCM and process them"""
-        fetcher = CDRFetcher(self.config)
+    def _store_file_results(self, filename: str, file_hash: str,
+                            fingerprint: Tuple[int, int],
+                            failed_records: Iterable[CDRRecord],
+                            totals: Dict) -> Tuple[int, int]:
+        """Store a parsed file's failed calls and mark the file processed"""
+        reprocessing = self.db.is_file_known(filename, file_hash)
+        
+        # One transaction per file: its calls and its processed_files row
+        # are committed together with a single sync
+        with self.db.conn:
+            failed_count = self.db.insert_failed_calls_no_commit(
+                failed_records, file_hash, dedupe=reprocessing
+            )
+            record_count = totals['records']
+            self.db.mark_file_processed_no_commit(
+                filename, file_hash, record_count, failed_count, *fingerprint
+            )
+        
+        logger.info(f"Processed {filename}: {record_count} records, {failed_count} failed calls")
+        return record_count, failed_count
+    
+    def _is_processed_content(self, filename: str, file_hash: str,
+                              fingerprint: Tuple[int, int]) -> bool:
+        """Check a file's hash against processed files, refreshing its fingerprint on a match"""
+        if self.db.is_file_processed(filename, file_hash):
+            logger.debug(f"Skipping already processed file: {filename}")
+            self.db.update_file_fingerprint(filename, *fingerprint)
+            return True
+        return False
+    
+    def _process_cdr_files(self, file_paths: List[str]) -> Tuple[int, int]:
+        """Parse CDR files and store their failed calls.
+        
+        Files whose name, size and mtime match a processed file are skipped
+        without being read. With more than one new file, worker processes
+        hash, decompress and parse each file in a single read while inserts
+        stay in this process (SQLite single writer). Otherwise each file is
+        hashed and then streamed straight into the database.
+        """
         total_records = 0
         total_failed = 0
+        pending = []
+        processed = self.db.get_processed_fingerprints(
+            os.path.basename(file_path) for file_path in file_paths
+        )
         
-        try:
-            fetcher.connect()
-            downloaded_files = fetcher.download_cdr_files(self.config.hours_to_analyze)
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+            file_stat = os.stat(file_path)
+            fingerprint = (file_stat.st_size, int(file_stat.st_mtime))
+            
+            if (filename, *fingerprint) in processed:
+                logger.debug(f"Skipping already processed file: {filename}")
+                continue
             
-            for file_path in downloaded_files:
+            pending.append((file_path, filename, fingerprint))
+        
+        workers = min(self.config.parse_workers or os.cpu_count() or 1, len(pending))
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_parse_failed_calls, [path for path, _, _ in pending],
+                                       chunksize=4)
+                for (file_path, filename, fingerprint), (failed_records, record_count, file_hash) \
+                        in zip(pending, results):
+                    file_hash = file_hash or self.parser.get_file_hash(file_path)
+                    if self._is_processed_content(filename, file_hash, fingerprint):
+                        continue
+                    
+                    record_count, failed_count = self._store_file_results(
+                        filename, file_hash, fingerprint, failed_records, {'records': record_count}
+                    )
+                    total_records += record_count
+                    total_failed += failed_count
+        else:
+            for file_path, filename, fingerprint in pending:
+                # The hash is stored on every inserted row, so it is needed
+                # before streaming starts
                 file_hash = self.parser.get_file_hash(file_path)
-                filename = os.path.basename(file_path)
-                
-                if self.db.is_file_processed(filename, file_hash):
-                    logger.debug(f"Skipping already processed file: {filename}")
+                if self._is_processed_content(filename, file_hash, fingerprint):
                     continue
                 
-                records, row_count = self.parser.parse_file(file_path)
-                total_records += len(records)
-                
-                failed_count = 0
-                for record in records:
-                    if record.is_failed:
-                        self.db.insert_failed_call(record, file_hash)
-                        failed_count += 1
-                
+                totals = {}
+                record_count, failed_count = self._store_file_results(
+                    filename, file_hash, fingerprint,
+                    self.parser.iter_failed_calls(file_path, totals), totals
+                )
+                total_records += record_count
                 total_failed += failed_count
-                
-                self.db.mark_file_processed(filename, file_hash, len(records), failed_count)
-                logger.info(f"Processed {filename}: {len(records)} records, {failed_count} failed calls")
+        
+        return total_records, total_failed
+    
+    def fetch_and_process_cdr_files(self) -> Tuple[int, int]:
+        """Fetch CDR files from CUCM and process them"""
+        fetcher = CDRFetcher(self.config)
+        total_records = 0
+        total_failed = 0
+        
+        try:
+            try:
+                fetcher.connect()
+                downloaded_files = fetcher.download_cdr_files(
+                    self.config.hours_to_analyze,
+                    is_processed=self.db.is_fingerprint_processed
+                )
+            finally:
+                # Close the SSH sessions before parsing: the parse pool must
+                # not fork while paramiko transport threads are running, and
+                # the sessions are not needed once the files are local
+                fetcher.disconnect()
+            
+            total_records, total_failed = self._process_cdr_files(downloaded_files)
             
         except Exception as e:
             logger.error(f"Error during CDR fetch/process: {e}")
             raise
-        finally:
-            fetcher.disconnect()
         
         return total_records, total_failed
     
     def process_local_cdr_files(self) -> Tuple[int, int]:
         """Process CDR files from local directory (no SFTP)"""
-        total_records = 0
-        total_failed = 0
-        
         local_dir = Path(self.config.local_cdr_dir)
         
         if not local_dir.exists():
@@ -1202,47 +1879,32 @@ class CDRReporter:
         
         logger.info(f"Found {len(cdr_files)} CDR files in {local_dir}")
         
-        for file_path in cdr_files:
-            file_hash = self.parser.get_file_hash(str(file_path))
-            filename = file_path.name
-            
-            if self.db.is_file_processed(filename, file_hash):
-                logger.debug(f"Skipping already processed file: {filename}")
-                continue
-            
-            records, row_count = self.parser.parse_file(str(file_path))
-            total_records += len(records)
-            
-            failed_count = 0
-            for record in records:
-                if record.is_failed:
-                    self.db.insert_failed_call(record, file_hash)
-                    failed_count += 1
-            
-            total_failed += failed_count
-            
-            self.db.mark_file_processed(filename, file_hash, len(records), failed_count)
-            logger.info(f"Processed {filename}: {len(records)} records, {failed_count} failed calls")
-        
-        return total_records, total_failed
+        return self._process_cdr_files([str(file_path) for file_path in cdr_files])
     
     def generate_and_send_report(self) -> bool:
         """Generate report and send via email"""
+        # One timestamp for the whole report, so the PDF, HTML, file name
+        # and email subject all agree
+        run_ts = datetime.now()
         
         stats = self.db.get_failure_statistics(self.config.hours_to_analyze)
-        failed_calls = self.db.get_failed_calls(self.config.hours_to_analyze)
+        failed_calls = self.db.get_failed_calls(
+            self.config.hours_to_analyze, limit=ReportGenerator.DETAIL_ROW_LIMIT
+        )
         
-        html_report = self.report_gen.generate_html_report(stats, failed_calls)
+        model = self.report_gen.build_model(stats, failed_calls, run_ts)
+        html_report = self.report_gen.render_html_report(model)
         
         report_dir = Path(self.config.report_output_dir)
         report_dir.mkdir(parents=True, exist_ok=True)
         
-        pdf_filename = f"cucm_failed_calls_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        pdf_filename = f"cucm_failed_calls_{run_ts.strftime('%Y%m%d_%H%M%S')}.pdf"
         pdf_path = str(report_dir / pdf_filename)
         
-        self.report_gen.generate_pdf_report(stats, failed_calls, pdf_path)
+        self.report_gen.render_pdf_report(model, pdf_path)
         
-        success = self.email_sender.send_report(html_report, pdf_path)
+        with self.email_sender:
+            success = self.email_sender.send_report(html_report, pdf_path, run_ts)
         
         return success
     
@@ -1252,9 +1914,10 @@ class CDRReporter:
         
         report_dir = Path(self.config.report_output_dir)
         if report_dir.exists():
-            cutoff = datetime.now() - timedelta(days=self.config.retention_days)
+            # Compare raw st_mtime floats rather than a datetime per file
+            cutoff_ts = (datetime.now() - timedelta(days=self.config.retention_days)).timestamp()
             for report_file in report_dir.glob('*.pdf'):
-                if datetime.fromtimestamp(report_file.stat().st_mtime) < cutoff:
+                if report_file.stat().st_mtime < cutoff_ts:
                     report_file.unlink()
                     logger.debug(f"Deleted old report: {report_file}")
     
@@ -1306,11 +1969,14 @@ def create_sample_config():
         cucm_username="cdr_user",
         cucm_password="your_password_here",
         cucm_cdr_path="/var/log/active/cm/cdr_repository/processed",
+        sftp_workers=4,
+        sftp_socket_buffer=0,
         local_cdr_dir="./cdr_files",
         database_path="./cdr_database.db",
         report_output_dir="./reports",
         hours_to_analyze=24,
         retention_days=7,
+        parse_workers=0,
         smtp_server="smtp.example.com",
         smtp_port=587,
         smtp_username="reports@example.com",
@@ -13,6 +13,8 @@ Usage:
 import os
 import csv
 import random
+from bisect import bisect
+from itertools import accumulate
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -56,17 +58,18 @@ FAILED_CAUSE_CODES = {
 
 SUCCESS_CAUSE_CODES = [0, 16]
 
+# Blank 128-column CDR row; each generated row is a copy with the used
+# columns filled in
+_EMPTY_ROW = [''] * 128
 
-def weighted_choice(choices_dict):
-    """Select a random key based on weighted values"""
-    total = sum(choices_dict.values())
-    r = random.uniform(0, total)
-    cumulative = 0
-    for choice, weight in choices_dict.items():
-        cumulative += weight
-        if r <= cumulative:
-            return choice
-    return list(choices_dict.keys())[0]
+# Cumulative weights for drawing failed cause codes by bisection
+_FAILED_CODES = list(FAILED_CAUSE_CODES)
+_FAILED_CUM_WEIGHTS = list(accumulate(FAILED_CAUSE_CODES.values()))
+
+
+def _random_failed_cause() -> int:
+    """Draw a failed cause code according to FAILED_CAUSE_CODES weights"""
+    return _FAILED_CODES[bisect(_FAILED_CUM_WEIGHTS, random.random() * _FAILED_CUM_WEIGHTS[-1])]
 
 
 def generate_cdr_row(timestamp: datetime, is_failed: bool = False) -> list:
@@ -86,7 +89,7 @@ def generate_cdr_row(timestamp: datetime, is_failed: bool = False) -> list:
     
     if is_failed:
         duration = 0
-        dest_cause = weighted_choice(FAILED_CAUSE_CODES)
+        dest_cause = _random_failed_cause()
         orig_cause = 0
         epoch_connect = 0
         epoch_disconnect = epoch_origination + random.randint(1, 30)
@@ -97,7 +100,7 @@ def generate_cdr_row(timestamp: datetime, is_failed: bool = False) -> list:
         epoch_connect = epoch_origination + random.randint(2, 10)
         epoch_disconnect = epoch_connect + duration
     
-    row = [''] * 128
+    row = _EMPTY_ROW.copy()
     
     row[0] = '1'
     row[1] = str(call_manager_id)
@@ -163,9 +166,7 @@ def generate_test_cdr_files(output_dir: str = './cdr_files',
                 total_failed += 1
         
         with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            for row in rows:
-                writer.writerow(row)
+            csv.writer(f).writerows(rows)
         
         print(f"  Created: {filename} ({num_calls} calls)")
     